@@ -3,26 +3,51 @@
 Tunisian Arabic Data Collection - Enhanced CLI with ID vs Keyword Modes
 """
 
-import argparse
+import re
 import sys
-import json
+import logging
+from logging.handlers import MemoryHandler
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
+from types import SimpleNamespace
 
 # Add current directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 
-from collectors.youtube_collector import YouTubeCollector
-from collectors.twitter_collector import TwitterCollector
-from collectors.reddit_collector import RedditCollector
 from utils.config import Config
 
-def setup_argparse():
-    """Setup enhanced command line argument parser"""
-    parser = argparse.ArgumentParser(
-        description='Collect data from social media platforms for Tunisian Arabic emotion detection',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+logger = logging.getLogger('collect')
+
+HELP_TEXT = """usage: collect.py --platform {youtube,twitter,reddit,all} --mode {id,keywords}
+                  [--limit LIMIT] [--output-format {jsonl,csv,parquet}]
+                  [--video-id VIDEO_ID] [--username USERNAME] [--tweet-id TWEET_ID]
+                  [--post-id POST_ID] [--keywords KEYWORDS [KEYWORDS ...]]
+                  [--subreddit SUBREDDIT] [--quiet]
+
+Collect data from social media platforms for Tunisian Arabic emotion detection
+
+options:
+  -h, --help            show this help message and exit
+  --platform {youtube,twitter,reddit,all}
+                        Platform to collect data from
+  --mode {id,keywords}  Collection mode: "id" for specific ID, "keywords" for search
+  --limit LIMIT         Maximum number of comments to collect (default: 100)
+  --output-format {jsonl,csv,parquet}
+                        Output file format (default: jsonl)
+  --quiet               Only report warnings and errors (no progress output)
+
+ID Mode Arguments:
+  --video-id VIDEO_ID   YouTube video ID (for YouTube platform)
+  --username USERNAME   Twitter username (for Twitter platform)
+  --tweet-id TWEET_ID   Twitter tweet ID (for Twitter platform)
+  --post-id POST_ID     Reddit post ID (for Reddit platform)
+
+Keywords Mode Arguments:
+  --keywords KEYWORDS [KEYWORDS ...]
+                        Keywords for search-based collection
+  --subreddit SUBREDDIT
+                        Subreddit to search in (for Reddit platform, default: all)
+
 Examples:
   # YouTube - Collect from specific video ID
   python collect.py --platform youtube --mode id --video-id "ABC123def456" --limit 500
@@ -47,71 +72,104 @@ Examples:
 
   # Collect from all platforms with keywords
   python collect.py --platform all --mode keywords --keywords "تونس" --limit 200
-        """
-    )
-    
-    # Basic arguments
-    parser.add_argument(
-        '--platform', 
-        choices=['youtube', 'twitter', 'reddit', 'all'],
-        required=True,
-        help='Platform to collect data from'
+"""
+
+# flag -> (attribute, takes_value, nargs); nargs '+' collects values until the next flag
+FLAGS = {
+    '--platform': ('platform', True, 1),
+    '--mode': ('mode', True, 1),
+    '--limit': ('limit', True, 1),
+    '--output-format': ('output_format', True, 1),
+    '--video-id': ('video_id', True, 1),
+    '--username': ('username', True, 1),
+    '--tweet-id': ('tweet_id', True, 1),
+    '--post-id': ('post_id', True, 1),
+    '--keywords': ('keywords', True, '+'),
+    '--subreddit': ('subreddit', True, 1),
+    '--quiet': ('quiet', False, 0),
+    '--help': ('help', False, 0),
+    '-h': ('help', False, 0),
+}
+
+CHOICES = {
+    'platform': ('youtube', 'twitter', 'reddit', 'all'),
+    'mode': ('id', 'keywords'),
+    'output_format': ('jsonl', 'csv', 'parquet'),
+}
+
+REQUIRED = ('platform', 'mode')
+
+# argparse treats a dash-prefixed token as an option unless it looks like a negative number
+_NEGATIVE_NUMBER = re.compile(r'^-\d+$|^-\d*\.\d+$')
+
+def _is_flag(token):
+    """Whether a token would be read as an option rather than a value"""
+    return token.startswith('-') and token != '-' and not _NEGATIVE_NUMBER.match(token)
+
+def _usage_error(message):
+    """Print a usage error and exit like argparse does"""
+    print(HELP_TEXT.split('\n\n', 1)[0], file=sys.stderr)
+    print(f"collect.py: error: {message}", file=sys.stderr)
+    sys.exit(2)
+
+def parse_args(argv=None):
+    """Parse command line arguments into a namespace without argparse"""
+    argv = sys.argv[1:] if argv is None else argv
+    args = SimpleNamespace(
+        platform=None, mode=None, limit=100, output_format='jsonl',
+        video_id=None, username=None, tweet_id=None, post_id=None,
+        keywords=None, subreddit='all', quiet=False, help=False,
     )
     
-    parser.add_argument(
-        '--mode',
-        choices=['id', 'keywords'],
-        required=True,
-        help='Collection mode: "id" for specific ID, "keywords" for search'
-    )
+    i = 0
+    while i < len(argv):
+        tok = argv[i]
+        flag, eq, inline = tok.partition('=')
+        if flag not in FLAGS:
+            _usage_error(f"unrecognized arguments: {tok}")
+        
+        attr, takes_value, nargs = FLAGS[flag]
+        i += 1
+        if not takes_value:
+            if eq:
+                _usage_error(f"argument {flag}: ignored explicit argument '{inline}'")
+            setattr(args, attr, True)
+            continue
+        
+        if eq:
+            values = [inline]
+        elif nargs == '+':
+            values = []
+            while i < len(argv) and not _is_flag(argv[i]):
+                values.append(argv[i])
+                i += 1
+        else:
+            values = argv[i:i + 1] if i < len(argv) and not _is_flag(argv[i]) else []
+            i += len(values)
+        
+        if not values:
+            _usage_error(f"argument {flag}: expected {'at least ' if nargs == '+' else ''}one argument")
+        setattr(args, attr, values if nargs == '+' else values[0])
     
-    parser.add_argument(
-        '--limit',
-        type=int,
-        default=100,
-        help='Maximum number of comments to collect (default: 100)'
-    )
+    if args.help:
+        print(HELP_TEXT)
+        sys.exit(0)
     
-    parser.add_argument(
-        '--output-format',
-        choices=['jsonl', 'csv', 'parquet'],
-        default='jsonl',
-        help='Output file format (default: jsonl)'
-    )
+    missing = [f"--{attr.replace('_', '-')}" for attr in REQUIRED if getattr(args, attr) is None]
+    if missing:
+        _usage_error(f"the following arguments are required: {', '.join(missing)}")
     
-    # ID mode arguments
-    id_group = parser.add_argument_group('ID Mode Arguments')
-    id_group.add_argument(
-        '--video-id',
-        help='YouTube video ID (for YouTube platform)'
-    )
-    id_group.add_argument(
-        '--username',
-        help='Twitter username (for Twitter platform)'
-    )
-    id_group.add_argument(
-        '--tweet-id',
-        help='Twitter tweet ID (for Twitter platform)'
-    )
-    id_group.add_argument(
-        '--post-id',
-        help='Reddit post ID (for Reddit platform)'
-    )
+    for attr, choices in CHOICES.items():
+        if getattr(args, attr) not in choices:
+            _usage_error(f"argument --{attr.replace('_', '-')}: invalid choice: '{getattr(args, attr)}' "
+                         f"(choose from {', '.join(repr(c) for c in choices)})")
     
-    # Keywords mode arguments
-    keywords_group = parser.add_argument_group('Keywords Mode Arguments')
-    keywords_group.add_argument(
-        '--keywords',
-        nargs='+',
-        help='Keywords for search-based collection'
-    )
-    keywords_group.add_argument(
-        '--subreddit',
-        default='all',
-        help='Subreddit to search in (for Reddit platform, default: all)'
-    )
+    try:
+        args.limit = int(args.limit)
+    except ValueError:
+        _usage_error(f"argument --limit: invalid int value: '{args.limit}'")
     
-    return parser
+    return args
 
 def validate_args(args):
     """Validate command line arguments"""
@@ -139,16 +197,22 @@ def validate_args(args):
     return True, []
 
 def get_collector(platform):
-    """Get the appropriate collector instance"""
-    collectors = {
-        'youtube': YouTubeCollector,
-        'twitter': TwitterCollector,
-        'reddit': RedditCollector
-    }
-    return collectors[platform]()
+    """Get the appropriate collector instance, importing only that platform's client"""
+    if platform == 'youtube':
+        from collectors.youtube_collector import YouTubeCollector
+        return YouTubeCollector()
+    if platform == 'twitter':
+        from collectors.twitter_collector import TwitterCollector
+        return TwitterCollector()
+    if platform == 'reddit':
+        from collectors.reddit_collector import RedditCollector
+        return RedditCollector()
+    raise KeyError(platform)
 
 def generate_output_filename(platform, mode, args):
     """Generate an output filename with timestamp"""
+    from datetime import datetime
+    
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     if mode == 'id':
@@ -193,13 +257,61 @@ def collect_data(collector, platform, args):
             return collector.collect_by_keywords(args.keywords, args.limit, **kwargs)
             
     except Exception as e:
-        print(f"❌ Collection error for {platform}: {e}")
-        return []
+        logger.error(f"❌ Collection error for {platform}: {e}")
+        return 0
+
+def _run_one(platform, args):
+    """Collect, save and summarize a single platform; returns its stats or None"""
+    logger.info(f"\n{'='*60}\n🔄 Collecting from {platform.upper()} - {args.mode.upper()} mode\n{'='*60}")
+    
+    collector = None
+    try:
+        # Each thread gets a fresh collector, so collected_data is never shared
+        collector = get_collector(platform)
+        
+        # Records are written to the output file as they are collected
+        output_file = generate_output_filename(platform, args.mode, args)
+        output_path = f"collected_data/{output_file}"
+        collector.open_sink(output_path, format=args.output_format)
+        
+        # Perform collection; collectors return a count, records go to the sink
+        collected_count = collect_data(collector, platform, args)
+        
+        if collected_count > 0:
+            # Finish writing the data
+            collector.save_data(output_path, format=args.output_format)
+            
+            # Collect stats
+            stats = collector.get_stats()
+            logger.info(f"📊 {platform}: {stats['total_collected']} items collected")
+            return stats
+        
+        logger.warning(f"⚠️ No data collected from {platform}")
+        
+    except Exception as e:
+        logger.error(f"❌ Error collecting from {platform}: {e}")
+    finally:
+        if collector is not None:
+            collector.close_sink()
+    
+    return None
+
+def setup_logging(quiet=False):
+    """Route collector status lines through a buffered handler; returns the buffer"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    # Batch writes to the console; errors still flush immediately
+    buffer = MemoryHandler(capacity=1000, flushLevel=logging.ERROR, target=handler)
+    logger.addHandler(buffer)
+    logger.setLevel(logging.WARNING if quiet else logging.INFO)
+    logger.propagate = False
+    return buffer
 
 def main():
     """Main CLI entry point"""
-    parser = setup_argparse()
-    args = parser.parse_args()
+    args = parse_args()
+    log_buffer = setup_logging(args.quiet)
     
     # Validate arguments
     is_valid, errors = validate_args(args)
@@ -226,34 +338,17 @@ def main():
     
     all_stats = []
     
-    for platform in platforms:
-        print(f"\n{'='*60}")
-        print(f"🔄 Collecting from {platform.upper()} - {args.mode.upper()} mode")
-        print(f"{'='*60}")
+    with ThreadPoolExecutor(max_workers=len(platforms)) as executor:
+        futures = {executor.submit(_run_one, platform, args): platform for platform in platforms}
         
-        try:
-            collector = get_collector(platform)
-            
-            # Perform collection
-            collected_count = len(collect_data(collector, platform, args))
-            
-            if collected_count > 0:
-                # Save data
-                output_file = generate_output_filename(platform, args.mode, args)
-                output_path = f"collected_data/{output_file}"
-                
-                collector.save_data(output_path, format=args.output_format)
-                
-                # Collect stats
-                stats = collector.get_stats()
+        for future in as_completed(futures):
+            stats = future.result()
+            if stats:
                 all_stats.append(stats)
-                print(f"📊 {platform}: {stats['total_collected']} items collected")
-            else:
-                print(f"⚠️ No data collected from {platform}")
-            
-        except Exception as e:
-            print(f"❌ Error collecting from {platform}: {e}")
-            continue
+    
+    # Keep the summary in platform order regardless of completion order
+    all_stats.sort(key=lambda stats: platforms.index(stats['platform']))
+    log_buffer.flush()
     
     # Print final summary
     if all_stats:
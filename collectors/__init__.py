@@ -3,9 +3,19 @@ Collectors package for Tunisian Arabic data collection.
 """
 
 from .base_collector import BaseCollector
-from .youtube_collector import YouTubeCollector
-from .twitter_collector import TwitterCollector
-from .reddit_collector import RedditCollector
+
+# Platform collectors pull in heavy API clients, so they are imported on first access
+_LAZY_COLLECTORS = {
+    'YouTubeCollector': '.youtube_collector',
+    'TwitterCollector': '.twitter_collector',
+    'RedditCollector': '.reddit_collector',
+}
+
+def __getattr__(name):
+    if name in _LAZY_COLLECTORS:
+        from importlib import import_module
+        return getattr(import_module(_LAZY_COLLECTORS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'BaseCollector',
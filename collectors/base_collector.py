@@ -1,16 +1,49 @@
 from abc import ABC, abstractmethod
-import pandas as pd
-from typing import List, Dict, Optional
+import csv
+import logging
+import orjson
+from collections import deque
 from tqdm import tqdm
-import json
-from datetime import datetime
+from typing import Callable, List, Dict, Optional, Set, Union
+from .record import CommentRecord
+from .sink import open_sink
+
+# Records kept for print_sample while streaming to a sink
+RECENT_SAMPLE = 10
+
+# Arabic spelling variants folded together (alef/hamza forms, taa marbuta, alef maqsura),
+# with tatweel and diacritics removed, so keyword matching ignores them
+_ARABIC_FOLD = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ؤ': 'و', 'ئ': 'ي', 'ى': 'ي', 'ة': 'ه',
+    'ـ': None,
+    '\u0670': None,
+    **{chr(mark): None for mark in range(0x064B, 0x0660)},
+})
+
+def _normalize_text(text: str) -> str:
+    """Casefold text and fold Arabic spelling variants for keyword matching"""
+    return text.casefold().translate(_ARABIC_FOLD)
 
 class BaseCollector(ABC):
     """Abstract base class for all data collectors"""
     
+    # Record field naming the video/tweet/thread a comment belongs to
+    source_key: Optional[str] = None
+    
     def __init__(self, platform: str):
         self.platform = platform
-        self.collected_data = []
+        self.logger = logging.getLogger(f'collect.{platform}')
+        # Columnar buffer: one list per field, all kept the same length
+        self._cols: Dict[str, list] = {}
+        self._count = 0
+        self._rows: Optional[List[Dict]] = None
+        self._seen_ids: Set[str] = set()
+        # Streaming output: records go straight to the sink instead of the buffer
+        self._sink = None
+        self._recent = deque(maxlen=RECENT_SAMPLE)
+        # Unique source ids, tracked as records are added
+        self._sources: Set[str] = set()
     
     @abstractmethod
     def authenticate(self):
@@ -18,65 +51,167 @@ class BaseCollector(ABC):
         pass
     
     @abstractmethod
-    def collect_by_id(self, source_id: str, limit: int = 100) -> List[Dict]:
-        """Collect comments from a specific ID (video, tweet, post)"""
+    def collect_by_id(self, source_id: str, limit: int = 100) -> int:
+        """Collect comments from a specific ID (video, tweet, post); returns how many new records were added"""
         pass
     
     @abstractmethod
-    def collect_by_keywords(self, keywords: List[str], limit: int = 100, **kwargs) -> List[Dict]:
-        """Collect comments by searching keywords"""
+    def collect_by_keywords(self, keywords: List[str], limit: int = 100, **kwargs) -> int:
+        """Collect comments by searching keywords; returns how many new records were added"""
         pass
     
+    @staticmethod
+    def _keyword_matcher(keywords: List[str]) -> Callable[[str], bool]:
+        """Predicate that is true when a text contains every word of some keyword, in any order, as platform search does"""
+        token_sets = [tokens for tokens in (_normalize_text(keyword).split() for keyword in keywords) if tokens]
+        if not token_sets:
+            return lambda text: True
+        
+        def matches(text: str) -> bool:
+            text = _normalize_text(text)
+            return any(all(token in text for token in tokens) for tokens in token_sets)
+        return matches
+    
+    def _progress(self, iterable=None, **kwargs) -> tqdm:
+        """Progress bar throttled to one redraw per second and hidden when info logging is off"""
+        kwargs.setdefault('mininterval', 1.0)
+        kwargs.setdefault('disable', not self.logger.isEnabledFor(logging.INFO))
+        return tqdm(iterable, **kwargs)
+    
+    def _add(self, record: Union[Dict, CommentRecord]) -> bool:
+        """Append a record (dict or CommentRecord) to the columnar buffer unless its id was already seen"""
+        is_dict = isinstance(record, dict)
+        record_id = record['id'] if is_dict else record.id
+        if record_id in self._seen_ids:
+            return False
+        self._seen_ids.add(record_id)
+        
+        source_id = None
+        if self.source_key:
+            source_id = record.get(self.source_key) if is_dict else getattr(record, self.source_key, None)
+        self._sources.add(source_id or 'unknown')
+        
+        if self._sink is not None:
+            self._emit(record)
+            return True
+        
+        cols = self._cols
+        for key, value in record.items():
+            column = cols.get(key)
+            if column is None:
+                column = cols[key] = [None] * self._count
+            column.append(value)
+        # Pad fields this record does not carry
+        for column in cols.values():
+            if len(column) == self._count:
+                column.append(None)
+        self._count += 1
+        self._rows = None
+        return True
+    
+    def _emit(self, record: Union[Dict, CommentRecord]):
+        """Write a record to the open sink, keeping only counters and a short sample"""
+        self._sink.write(record)
+        self._recent.append(record)
+        self._count += 1
+    
+    def open_sink(self, filename: str, format: str = 'jsonl'):
+        """Stream records to filename as they are collected instead of buffering them"""
+        self._sink = open_sink(filename, format)
+    
+    def close_sink(self):
+        """Flush and close the streaming sink, if one is open"""
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _extend(self, records: List[Union[Dict, CommentRecord]]) -> int:
+        """Append several records, returning how many were not duplicates"""
+        return sum(1 for record in records if self._add(record))
+    
+    @property
+    def collected_data(self) -> List[Dict]:
+        """Collected records rebuilt from the columnar buffer, or the latest few when streaming"""
+        if self._recent:
+            return [dict(record.items()) for record in self._recent]
+        if self._rows is None:
+            keys = list(self._cols)
+            self._rows = [dict(zip(keys, values)) for values in zip(*self._cols.values())]
+        return self._rows
+    
     def save_data(self, filename: str, format: str = 'jsonl'):
         """Save collected data to file"""
-        if not self.collected_data:
-            print(f"⚠️ No data collected from {self.platform}")
+        if not self._count:
+            self.close_sink()
+            self.logger.warning(f"⚠️ No data collected from {self.platform}")
             return False
             
-        df = pd.DataFrame(self.collected_data)
-        
         try:
-            if format == 'jsonl':
-                df.to_json(filename, orient='records', lines=True, force_ascii=False, indent=2)
+            if self._sink is not None:
+                # Records were already written as they arrived
+                self.close_sink()
+            elif format == 'jsonl':
+                # One compact object per line; orjson emits UTF-8 bytes directly
+                keys = list(self._cols)
+                with open(filename, 'wb', buffering=1 << 20) as f:
+                    for values in zip(*self._cols.values()):
+                        f.write(orjson.dumps(dict(zip(keys, values))))
+                        f.write(b'\n')
             elif format == 'csv':
-                df.to_csv(filename, index=False, encoding='utf-8')
+                # Rows are zipped straight from the columns, no per-row dicts
+                with open(filename, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(self._cols)
+                    writer.writerows(zip(*self._cols.values()))
             elif format == 'parquet':
-                df.to_parquet(filename, index=False)
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                
+                pq.write_table(pa.Table.from_pydict(self._cols), filename)
             else:
                 raise ValueError(f"Unsupported format: {format}")
                 
-            print(f"✅ Saved {len(self.collected_data)} items to {filename}")
+            self.logger.info(f"✅ Saved {self._count} items to {filename}")
             return True
             
         except Exception as e:
-            print(f"❌ Error saving data: {e}")
+            self.logger.error(f"❌ Error saving data: {e}")
             return False
     
     def get_stats(self) -> Dict:
         """Get collection statistics"""
-        sources = set()
-        for item in self.collected_data:
-            source_id = item.get('video_id') or item.get('tweet_id') or item.get('thread_id') or 'unknown'
-            sources.add(source_id)
-            
+        from datetime import datetime
+        
         return {
             'platform': self.platform,
-            'total_collected': len(self.collected_data),
-            'unique_sources': len(sources),
+            'total_collected': self._count,
+            'unique_sources': len(self._sources),
             'timestamp': datetime.now().isoformat()
         }
     
     def clear_data(self):
         """Clear collected data from memory"""
-        self.collected_data.clear()
-        print(f"🧹 Cleared data from {self.platform}")
+        self._cols.clear()
+        self._seen_ids.clear()
+        self._recent.clear()
+        self._sources.clear()
+        self._count = 0
+        self._rows = None
+        self.logger.info(f"🧹 Cleared data from {self.platform}")
     
     def print_sample(self, n: int = 3):
         """Print sample of collected data"""
-        if not self.collected_data:
+        if not self._count:
             print("No data to display")
             return
             
-        print(f"\n📋 Sample of {len(self.collected_data)} items from {self.platform}:")
-        for i, item in enumerate(self.collected_data[:n]):
-            print(f"  {i+1}. {item.get('text_raw', '')[:80]}...")
\ No newline at end of file
+        print(f"\n📋 Sample of {self._count} items from {self.platform}:")
+        if self._recent:
+            texts = [item.get('text_raw') for item in self.collected_data[:n]]
+        else:
+            texts = self._cols.get('text_raw', [])[:n]
+        for i, text in enumerate(texts):
+            print(f"  {i+1}. {(text or '')[:80]}...")
@@ -0,0 +1,67 @@
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional, Tuple
+
+@lru_cache(maxsize=None)
+def _field_names(cls) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+class CommentRecord:
+    """Base for slotted comment records; iterates like a dict via items()"""
+    
+    __slots__ = ()
+    
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """(field, value) pairs in declaration order"""
+        return ((name, getattr(self, name)) for name in _field_names(type(self)))
+
+@dataclass(slots=True, kw_only=True)
+class RedditComment(CommentRecord):
+    """A Reddit comment"""
+    source: str = 'reddit'
+    id: str
+    text_raw: str
+    user: str
+    created_at: float
+    score: int
+    thread_id: str
+    parent_id: str
+    is_submitter: bool
+    subreddit: str
+    collection_method: Optional[str] = None
+    collection_timestamp: float
+    search_keywords: Optional[List[str]] = None
+    search_subreddit: Optional[str] = None
+
+@dataclass(slots=True, kw_only=True)
+class Tweet(CommentRecord):
+    """A tweet or reply"""
+    source: str = 'twitter'
+    id: str
+    tweet_id: Optional[str] = None
+    text_raw: str
+    user: str
+    created_at: Optional[str]
+    likes: int
+    retweets: int
+    reply_count: int
+    is_reply: bool
+    collection_timestamp: float
+    collection_method: Optional[str] = None
+    search_keywords: Optional[List[str]] = None
+
+@dataclass(slots=True, kw_only=True)
+class YouTubeComment(CommentRecord):
+    """A top-level YouTube comment"""
+    source: str = 'youtube'
+    id: str
+    video_id: str
+    text_raw: str
+    user: str
+    created_at: str
+    likes: int
+    reply_count: int
+    parent_id: Optional[str] = None
+    collection_timestamp: float
+    collection_method: Optional[str] = None
+    search_keywords: Optional[List[str]] = None
@@ -1,16 +1,36 @@
 import praw
-from typing import List, Dict, Optional
-from tqdm import tqdm
+from typing import List, Dict, Optional, Tuple
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from .base_collector import BaseCollector
+from .record import RedditComment
 from utils.config import Config
+from utils.http import pooled_session
+
+# Bodies Reddit substitutes for deleted or moderator-removed content
+_TOMBSTONES = frozenset(('[deleted]', '[removed]'))
+
+def _make_client(client_id: str, client_secret: str, user_agent: str) -> praw.Reddit:
+    """Build a read-only Reddit client with its own pooled session"""
+    return praw.Reddit(
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent=user_agent,
+        requestor_kwargs={'session': pooled_session()},
+    )
 
 class RedditCollector(BaseCollector):
     """Reddit comments collector"""
     
+    source_key = 'thread_id'
+    
     def __init__(self):
         super().__init__('reddit')
         self.reddit = None
+        # PRAW is not thread-safe, so every worker thread gets its own client
+        self._local = threading.local()
     
     def authenticate(self):
         """Authenticate with Reddit API (read-only)"""
@@ -18,153 +38,224 @@ class RedditCollector(BaseCollector):
             if not all([Config.REDDIT_CLIENT_ID, Config.REDDIT_CLIENT_SECRET, Config.REDDIT_USER_AGENT]):
                 raise ValueError("Reddit API credentials incomplete")
                 
-            self.reddit = praw.Reddit(
-                client_id=Config.REDDIT_CLIENT_ID,
-                client_secret=Config.REDDIT_CLIENT_SECRET, 
-                user_agent=Config.REDDIT_USER_AGENT,
-            )
+            self.reddit = self._client()
             
-            print("✅ Reddit API authenticated successfully (read-only)")
+            self.logger.info("✅ Reddit API authenticated successfully (read-only)")
             return True
             
         except Exception as e:
-            print(f"❌ Reddit authentication failed: {e}")
+            self.logger.error(f"❌ Reddit authentication failed: {e}")
             return False
     
-    def collect_by_id(self, post_id: str, limit: int = 100) -> List[Dict]:
+    def collect_by_id(self, post_id: str, limit: int = 100) -> int:
         """Collect comments from a specific post safely"""
         if not self.reddit:
             if not self.authenticate():
-                return []
+                return 0
 
-        print(f"🎯 Reddit direct mode for post: {post_id}")
+        self.logger.info(f"🎯 Reddit direct mode for post: {post_id}")
 
         try:
-            submission = self.reddit.submission(id=post_id)
+            post, comment_list = self._fetch_thread(post_id, limit)
 
             # Quick existence check
-            if submission.removed_by_category:# or submission.over_18:
-                print(f"⚠️ Post {post_id} is removed, restricted, or NSFW. Skipping.")
-                return []
-
-            submission.comments.replace_more(limit=0)
-            comment_list = submission.comments.list()[:limit]
+            if post.get('removed_by_category'):# or post.get('over_18'):
+                self.logger.warning(f"⚠️ Post {post_id} is removed, restricted, or NSFW. Skipping.")
+                return 0
 
             comments = []
-            for comment in tqdm(comment_list, desc=f"📝 Post {post_id[:8]}..."):
-                if hasattr(comment, 'body') and comment.body not in ['[deleted]', '[removed]']:
-                    comment_data = {'source': 'reddit', 'id': comment.id, 'text_raw': comment.body, 'user': str(comment.author) if comment.author else '[deleted]', 'created_at': comment.created_utc, 'score': comment.score, 'thread_id': post_id, 'parent_id': comment.parent_id, 'is_submitter': comment.is_submitter, 'subreddit': str(comment.subreddit), 'collection_method': 'direct_post_id', 'collection_timestamp': time.time()}
-                    comments.append(comment_data)
+            batch_timestamp = time.time()
+            for comment in self._progress(comment_list[:limit], desc=f"📝 Post {post_id[:8]}..."):
+                body = comment.get('body')
+                if body is None or body in _TOMBSTONES:
+                    continue
+                comments.append(self._make_comment(comment, post_id, batch_timestamp, 'direct_post_id'))
 
-            self.collected_data.extend(comments)
-            return comments
+            return self._extend(comments)
 
         except praw.exceptions.PRAWException as e:
-            print(f"❌ Reddit API error for post {post_id}: {e}")
+            self.logger.error(f"❌ Reddit API error for post {post_id}: {e}")
         except Exception as e:
-            print(f"❌ Unexpected error getting comments for post {post_id}: {e}")
+            self.logger.error(f"❌ Unexpected error getting comments for post {post_id}: {e}")
 
-        return []
+        return 0
 
-    def collect_by_keywords(self, keywords: List[str], limit: int = 100, **kwargs) -> List[Dict]:
+    def collect_by_keywords(self, keywords: List[str], limit: int = 100, **kwargs) -> int:
         """Collect comments by searching keywords in subreddit"""
         subreddit = kwargs.get('subreddit', 'all')
         
         if not self.reddit:
             if not self.authenticate():
-                return []
+                return 0
         
-        print(f"🎯 Reddit search mode in r/{subreddit} with keywords: {keywords}")
+        self.logger.info(f"🎯 Reddit search mode in r/{subreddit} with keywords: {keywords}")
         comments = self._search_and_collect(subreddit, keywords, limit)
         
         # Update collection method
         for comment in comments:
-            comment['collection_method'] = 'keyword_search'
-            comment['search_keywords'] = keywords
-            comment['search_subreddit'] = subreddit
+            comment.collection_method = 'keyword_search'
+            comment.search_keywords = keywords
+            comment.search_subreddit = subreddit
             
-        self.collected_data.extend(comments)
-        return comments
+        return self._extend(comments)
+
+    def _client(self) -> praw.Reddit:
+        """The calling thread's Reddit client, created on first use"""
+        client = getattr(self._local, 'reddit', None)
+        if client is None:
+            client = self._local.reddit = _make_client(
+                Config.REDDIT_CLIENT_ID,
+                Config.REDDIT_CLIENT_SECRET,
+                Config.REDDIT_USER_AGENT,
+            )
+        return client
 
-    def _get_post_comments(self, post_id: str, max_comments: int = 100) -> List[Dict]:
+    def _fetch_thread(self, post_id: str, limit: int) -> Tuple[Dict, List[Dict]]:
+        """Fetch a post and its comment tree, flattened breadth-first, in one request"""
+        listings = self._client().request(method='GET', path=f'comments/{post_id}/', params={'limit': limit})
+        post = listings[0]['data']['children'][0]['data']
+        
+        comments = []
+        pending = deque(listings[1]['data']['children'])
+        while pending:
+            child = pending.popleft()
+            if child['kind'] != 't1':  # "more" stubs are dropped, as replace_more(limit=0) does
+                continue
+            data = child['data']
+            comments.append(data)
+            if data.get('replies'):
+                pending.extend(data['replies']['data']['children'])
+        
+        return post, comments
+
+    @staticmethod
+    def _make_comment(comment: Dict, post_id: str, batch_timestamp: float,
+                      collection_method: Optional[str] = None) -> RedditComment:
+        """Build a record from a raw comment listing entry"""
+        return RedditComment(
+            id=comment['id'],
+            text_raw=comment['body'],
+            user=comment.get('author') or '[deleted]',
+            created_at=comment['created_utc'],
+            score=comment['score'],
+            thread_id=post_id,
+            parent_id=comment['parent_id'],
+            is_submitter=comment.get('is_submitter', False),
+            subreddit=comment['subreddit'],
+            collection_method=collection_method,
+            collection_timestamp=batch_timestamp
+        )
+
+    def _get_post_comments(self, post_id: str, max_comments: int = 100) -> List[RedditComment]:
         """Get comments from a specific post"""
         comments = []
+        batch_timestamp = time.time()
         
         try:
-            submission = self.reddit.submission(id=post_id)
-            submission.comments.replace_more(limit=0)
-            
-            comment_list = submission.comments.list()[:max_comments]
+            _, comment_list = self._fetch_thread(post_id, max_comments)
             
-            for comment in tqdm(comment_list, desc=f"📝 Post {post_id[:8]}..."):
-                if hasattr(comment, 'body') and comment.body not in ['[deleted]', '[removed]']:
-                    comment_data = {
-                        'source': 'reddit',
-                        'id': comment.id,
-                        'text_raw': comment.body,
-                        'user': str(comment.author) if comment.author else '[deleted]',
-                        'created_at': comment.created_utc,
-                        'score': comment.score,
-                        'thread_id': post_id,
-                        'parent_id': comment.parent_id,
-                        'is_submitter': comment.is_submitter,
-                        'subreddit': str(comment.subreddit),
-                        'collection_timestamp': time.time()
-                    }
-                    comments.append(comment_data)
+            for comment in self._progress(comment_list[:max_comments], desc=f"📝 Post {post_id[:8]}..."):
+                body = comment.get('body')
+                if body is None or body in _TOMBSTONES:
+                    continue
+                comments.append(self._make_comment(comment, post_id, batch_timestamp))
                     
         except Exception as e:
-            print(f"❌ Error getting comments for post {post_id}: {e}")
+            self.logger.error(f"❌ Error getting comments for post {post_id}: {e}")
         
         return comments
 
-    def _search_and_collect(self, subreddit_name: str, keywords: List[str], limit: int = 100) -> List[Dict]:
+    def _search_and_collect(self, subreddit_name: str, keywords: List[str], limit: int = 100) -> List[RedditComment]:
         """Search for posts by keywords and collect comments"""
         posts = self._search_subreddit_posts(subreddit_name, keywords, limit // 10)
-        print(f"🔍 Found {len(posts)} posts matching keywords")
+        self.logger.info(f"🔍 Found {len(posts)} posts matching keywords")
         
         comments = []
-        comments_per_post = max(1, limit // len(posts)) if posts else 0
+        if not posts:
+            return comments
+            
+        comments_per_post = max(1, limit // len(posts))
+        remaining = limit
+        workers = min(8, len(posts))
+        post_iter = iter(posts)
+        pending = {}
         
-        for post in posts:
-            if len(comments) >= limit:
-                break
-            post_comments = self._get_post_comments(post['id'], comments_per_post)
-            comments.extend(post_comments)
-            print(f"  ✅ Post {post['id'][:8]}: {len(post_comments)} comments")
+        # Keep a bounded window of post fetches in flight, each sized to the budget left when it starts
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            def submit_next():
+                post = next(post_iter, None)
+                if post is not None:
+                    take = min(remaining, comments_per_post * 2)
+                    pending[executor.submit(self._get_post_comments, post['id'], take)] = post
+            
+            for _ in range(workers):
+                submit_next()
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    post = pending.pop(future)
+                    post_comments = future.result()[:max(remaining, 0)]
+                    comments.extend(post_comments)
+                    remaining -= len(post_comments)
+                    self.logger.info(f"  ✅ Post {post['id'][:8]}: {len(post_comments)} comments")
+                    if remaining > 0:
+                        submit_next()
+                
+                if remaining <= 0:
+                    # Budget is spent: drop fetches that have not started yet
+                    for future in pending:
+                        future.cancel()
+                    break
             
         return comments
 
     def _search_subreddit_posts(self, subreddit_name: str, keywords: List[str], max_posts: int = 50) -> List[Dict]:
         """Search for posts in a subreddit by keywords"""
         posts_data = []
+        batch_timestamp = time.time()
         
         try:
-            subreddit = self.reddit.subreddit(subreddit_name)
+            per_keyword = max_posts // len(keywords)
+            # Reddit search matches loosely, so keep only posts that actually mention a keyword
+            matches = self._keyword_matcher(keywords)
             
-            for keyword in keywords:
-                print(f"🔍 Searching r/{subreddit_name} for: '{keyword}'")
-                
-                posts = list(subreddit.search(keyword, limit=max_posts // len(keywords)))
+            def _search_one(keyword: str) -> List[Dict]:
+                self.logger.info(f"🔍 Searching r/{subreddit_name} for: '{keyword}'")
+                found = []
+                subreddit = self._client().subreddit(subreddit_name)
                 
-                for post in posts:
-                    if post.selftext not in ['[deleted]', '[removed]']:
+                for post in subreddit.search(keyword, limit=per_keyword):
+                    text = f"{post.title} {post.selftext}".strip()
+                    if post.selftext not in _TOMBSTONES and matches(text):
                         post_data = {
                             'source': 'reddit',
                             'id': post.id,
-                            'text_raw': f"{post.title} {post.selftext}".strip(),
-                            'user': str(post.author) if post.author else '[deleted]',
+                            'text_raw': text,
+                            'user': getattr(post.author, 'name', None) or '[deleted]',
                             'created_at': post.created_utc,
                             'score': post.score,
                             'num_comments': post.num_comments,
                             'subreddit': subreddit_name,
                             'is_post': True,
-                            'collection_timestamp': time.time()
+                            'collection_timestamp': batch_timestamp
                         }
-                        posts_data.append(post_data)
-                        print(f"  📝 Found: {post.title[:60]}...")
+                        found.append(post_data)
+                        self.logger.info(f"  📝 Found: {post.title[:60]}...")
+                
+                return found
+            
+            # Keyword searches are independent network round-trips, so overlap them
+            # A post matching several keywords is only kept (and later fetched) once
+            seen_posts = set()
+            with ThreadPoolExecutor(max_workers=min(8, len(keywords))) as executor:
+                for found in executor.map(_search_one, keywords):
+                    for post_data in found:
+                        if post_data['id'] not in seen_posts:
+                            seen_posts.add(post_data['id'])
+                            posts_data.append(post_data)
                     
         except Exception as e:
-            print(f"❌ Error searching r/{subreddit_name}: {e}")
+            self.logger.error(f"❌ Error searching r/{subreddit_name}: {e}")
         
-        return posts_data
\ No newline at end of file
+        return posts_data
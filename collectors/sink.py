@@ -0,0 +1,116 @@
+import csv
+import orjson
+import types
+from typing import Dict, List, Optional, Union, get_args, get_origin, get_type_hints
+from .record import CommentRecord, _field_names
+
+# Rows buffered per parquet row group
+PARQUET_ROW_GROUP = 10_000
+
+class JsonlSink:
+    """Writes one compact JSON object per line as records arrive"""
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = None
+    
+    def write(self, record: Union[Dict, CommentRecord]):
+        # Opened on first write so an empty collection leaves no file behind
+        if self._file is None:
+            self._file = open(self.filename, 'wb', buffering=1 << 20)
+        self._file.write(orjson.dumps(record))
+        self._file.write(b'\n')
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def _arrow_type(pa, annotation):
+    """Arrow type for a record field annotation; Optional[X] maps to a nullable X"""
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return _arrow_type(pa, next(arg for arg in get_args(annotation) if arg is not type(None)))
+    if origin is list:
+        return pa.list_(_arrow_type(pa, get_args(annotation)[0]))
+    return {str: pa.string(), int: pa.int64(), float: pa.float64(), bool: pa.bool_()}[annotation]
+
+def _arrow_schema(pa, record_type, rows: List[Dict]):
+    """Schema declared by the record class, or inferred from rows for plain dicts"""
+    if issubclass(record_type, CommentRecord):
+        hints = get_type_hints(record_type)
+        return pa.schema([(name, _arrow_type(pa, hints[name])) for name in _field_names(record_type)])
+    
+    # A column that is None throughout the first row group would be typed null and reject later values
+    schema = pa.Table.from_pylist(rows).schema
+    return pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in schema])
+
+class CsvSink:
+    """Writes CSV rows as records arrive; the header comes from the record class (or the first dict)"""
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = None
+        self._writer = None
+    
+    def write(self, record: Union[Dict, CommentRecord]):
+        row = dict(record.items())
+        if self._writer is None:
+            fieldnames = list(_field_names(type(record))) if isinstance(record, CommentRecord) else list(row)
+            self._file = open(self.filename, 'w', newline='', encoding='utf-8')
+            # Unknown keys raise instead of being dropped from the output
+            self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+            self._writer.writeheader()
+        self._writer.writerow(row)
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+class ParquetSink:
+    """Buffers records into row groups and appends them to a parquet file"""
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._rows: List[Dict] = []
+        self._record_type: Optional[type] = None
+        self._writer = None
+    
+    def write(self, record: Union[Dict, CommentRecord]):
+        if self._record_type is None:
+            self._record_type = type(record)
+        self._rows.append(dict(record.items()))
+        if len(self._rows) >= PARQUET_ROW_GROUP:
+            self._flush()
+    
+    def _flush(self):
+        if not self._rows:
+            return
+            
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.filename, _arrow_schema(pa, self._record_type, self._rows))
+        self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self._writer.schema))
+        self._rows.clear()
+    
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+SINKS = {
+    'jsonl': JsonlSink,
+    'csv': CsvSink,
+    'parquet': ParquetSink,
+}
+
+def open_sink(filename: str, format: str = 'jsonl'):
+    """Create the streaming writer for an output format"""
+    if format not in SINKS:
+        raise ValueError(f"Unsupported format: {format}")
+    return SINKS[format](filename)
@@ -1,200 +1,209 @@
 import tweepy
-from typing import List, Dict, Optional
-from tqdm import tqdm
+from typing import Iterator, List, Dict, Optional, Tuple
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from .base_collector import BaseCollector
+from .record import Tweet
 from utils.config import Config
+from utils.http import pooled_session
+
+# Fields requested on every v2 tweet lookup; authors come inline through the author_id expansion
+TWEET_FIELDS = ['created_at', 'public_metrics', 'in_reply_to_user_id', 'referenced_tweets', 'conversation_id']
+
+@lru_cache(maxsize=None)
+def _make_client(bearer_token: str) -> tweepy.Client:
+    """Build a Twitter API v2 client, reused for as long as the bearer token is unchanged"""
+    client = tweepy.Client(bearer_token=bearer_token, wait_on_rate_limit=True)
+    # Keyword workers share this client, so give them a connection each
+    client.session = pooled_session()
+    return client
 
 class TwitterCollector(BaseCollector):
     """Twitter/X comments collector"""
     
+    source_key = 'tweet_id'
+    
     def __init__(self):
         super().__init__('twitter')
-        self.api = None
+        self.client = None
     
     def authenticate(self):
-        """Authenticate with Twitter API using OAuth1"""
+        """Authenticate with Twitter API v2 using an app bearer token"""
         try:
-            if not all([Config.TWITTER_API_KEY, Config.TWITTER_API_SECRET, 
-                       Config.TWITTER_ACCESS_TOKEN, Config.TWITTER_ACCESS_SECRET]):
-                raise ValueError("Twitter API credentials incomplete")
+            if not Config.TWITTER_BEARER_TOKEN:
+                raise ValueError("Twitter API bearer token not found in configuration")
                 
-            auth = tweepy.OAuthHandler(
-                Config.TWITTER_API_KEY, 
-                Config.TWITTER_API_SECRET
-            )
-            auth.set_access_token(
-                Config.TWITTER_ACCESS_TOKEN,
-                Config.TWITTER_ACCESS_SECRET
-            )
-            self.api = tweepy.API(auth, wait_on_rate_limit=True)
-            print("✅ Twitter API authenticated successfully")
+            self.client = _make_client(Config.TWITTER_BEARER_TOKEN)
+            self.logger.info("✅ Twitter API authenticated successfully")
             return True
             
         except Exception as e:
-            print(f"❌ Twitter authentication failed: {e}")
+            self.logger.error(f"❌ Twitter authentication failed: {e}")
             return False
 
-    def collect_by_id(self, source_id: str, limit: int = 100, id_type: str = 'username') -> List[Dict]:
+    def collect_by_id(self, source_id: str, limit: int = 100, id_type: str = 'username') -> int:
         """Collect from specific ID (username or tweet_id)"""
-        if not self.api:
+        if not self.client:
             if not self.authenticate():
-                return []
+                return 0
         
         comments = []
         
         try:
             if id_type == 'username':
-                print(f"🎯 Twitter user mode: @{source_id}")
+                self.logger.info(f"🎯 Twitter user mode: @{source_id}")
                 comments = self._get_user_tweets(source_id, limit)
                 for comment in comments:
-                    comment['collection_method'] = 'direct_username'
+                    comment.collection_method = 'direct_username'
                     
             elif id_type == 'tweet_id':
-                print(f"🎯 Twitter tweet mode: {source_id}")
+                self.logger.info(f"🎯 Twitter tweet mode: {source_id}")
                 comments = self._get_tweet_replies(source_id, limit)
                 for comment in comments:
-                    comment['collection_method'] = 'direct_tweet_id'
+                    comment.collection_method = 'direct_tweet_id'
                     
             else:
-                print(f"❌ Invalid Twitter ID type: {id_type}")
-                return []
+                self.logger.error(f"❌ Invalid Twitter ID type: {id_type}")
+                return 0
                 
         except Exception as e:
-            print(f"❌ Error during Twitter ID collection: {e}")
-            return []
+            self.logger.error(f"❌ Error during Twitter ID collection: {e}")
+            return 0
         
-        self.collected_data.extend(comments)
-        return comments
+        return self._extend(comments)
 
-    def collect_by_keywords(self, keywords: List[str], limit: int = 100, **kwargs) -> List[Dict]:
+    def collect_by_keywords(self, keywords: List[str], limit: int = 100, **kwargs) -> int:
         """Collect tweets by searching keywords"""
-        if not self.api:
+        if not self.client:
             if not self.authenticate():
-                return []
+                return 0
         
-        print(f"🎯 Twitter search mode with keywords: {keywords}")
+        self.logger.info(f"🎯 Twitter search mode with keywords: {keywords}")
         comments = self._search_tweets_by_keywords(keywords, limit)
         
         # Update collection method
         for comment in comments:
-            comment['collection_method'] = 'keyword_search'
-            comment['search_keywords'] = keywords
+            comment.collection_method = 'keyword_search'
+            comment.search_keywords = keywords
             
-        self.collected_data.extend(comments)
-        return comments
+        return self._extend(comments)
+
+    @staticmethod
+    def _make_tweet(tweet: tweepy.Tweet, username: Optional[str], batch_timestamp: float,
+                    is_reply: bool, tweet_id: Optional[str] = None) -> Tweet:
+        """Build a record from a v2 tweet and its expanded author"""
+        metrics = tweet.public_metrics or {}
+        return Tweet(
+            id=str(tweet.id),
+            tweet_id=tweet_id,
+            text_raw=tweet.text,
+            user=username,
+            created_at=tweet.created_at.isoformat(timespec='seconds') if tweet.created_at else None,
+            likes=metrics.get('like_count', 0),
+            retweets=metrics.get('retweet_count', 0),
+            reply_count=metrics.get('reply_count', 0),
+            is_reply=is_reply,
+            collection_timestamp=batch_timestamp
+        )
 
-    def _get_tweet_replies(self, tweet_id: str, max_replies: int = 100) -> List[Dict]:
+    def _paginate(self, method, limit: int, desc: str, *args, **params) -> Iterator[Tuple[tweepy.Tweet, Optional[str]]]:
+        """Yield (tweet, author username) pairs across result pages, up to limit tweets"""
+        count = 0
+        with self._progress(total=limit, desc=desc) as pbar:
+            for page in tweepy.Paginator(method, *args,
+                                         max_results=100,
+                                         expansions='author_id',
+                                         tweet_fields=TWEET_FIELDS,
+                                         user_fields='username',
+                                         **params):
+                # One users lookup per page instead of one request per tweet author
+                usernames = {user.id: user.username for user in page.includes.get('users', [])}
+                
+                for tweet in page.data or []:
+                    yield tweet, usernames.get(tweet.author_id)
+                    count += 1
+                    pbar.update(1)
+                    if count >= limit:
+                        return
+
+    def _get_tweet_replies(self, tweet_id: str, max_replies: int = 100) -> List[Tweet]:
         """Get replies to a specific tweet"""
         replies = []
+        batch_timestamp = time.time()
         
         try:
-            original_tweet = self.api.get_status(tweet_id, tweet_mode='extended')
-            conversation_id = original_tweet.id_str
+            original_tweet = self.client.get_tweet(tweet_id, tweet_fields=['conversation_id', 'author_id']).data
             
-            print(f"🔍 Searching for replies to tweet {tweet_id}...")
+            self.logger.info(f"🔍 Searching for replies to tweet {tweet_id}...")
             
-            query = f"conversation_id:{conversation_id}"
+            query = f"conversation_id:{original_tweet.conversation_id}"
             
-            for tweet in tqdm(tweepy.Cursor(self.api.search_tweets, 
-                                          q=query,
-                                          tweet_mode='extended',
-                                          count=100).items(max_replies),
-                            total=max_replies, desc="Replies"):
+            for tweet, username in self._paginate(self.client.search_recent_tweets, max_replies, "Replies", query=query):
+                replied_to = {ref.id for ref in tweet.referenced_tweets or [] if ref.type == 'replied_to'}
                 
-                if (tweet.in_reply_to_status_id_str == tweet_id or 
-                    tweet.in_reply_to_user_id_str == original_tweet.user.id_str):
+                if (int(tweet_id) in replied_to or 
+                    tweet.in_reply_to_user_id == original_tweet.author_id):
                     
-                    tweet_data = {
-                        'source': 'twitter',
-                        'id': tweet.id_str,
-                        'tweet_id': tweet_id,
-                        'text_raw': tweet.full_text,
-                        'user': tweet.user.screen_name,
-                        'created_at': tweet.created_at.isoformat() if tweet.created_at else None,
-                        'likes': tweet.favorite_count,
-                        'retweets': tweet.retweet_count,
-                        'reply_count': getattr(tweet, 'reply_count', 0),
-                        'is_reply': True,
-                        'collection_timestamp': time.time()
-                    }
-                    replies.append(tweet_data)
+                    replies.append(self._make_tweet(tweet, username, batch_timestamp, is_reply=True, tweet_id=tweet_id))
                 
         except tweepy.TweepyException as e:
-            print(f"❌ Error getting replies for tweet {tweet_id}: {e}")
+            self.logger.error(f"❌ Error getting replies for tweet {tweet_id}: {e}")
         except Exception as e:
-            print(f"❌ Unexpected error for tweet {tweet_id}: {e}")
+            self.logger.error(f"❌ Unexpected error for tweet {tweet_id}: {e}")
         
         return replies
 
-    def _search_tweets_by_keywords(self, keywords: List[str], max_tweets: int = 100) -> List[Dict]:
+    def _search_tweets_by_keywords(self, keywords: List[str], max_tweets: int = 100) -> List[Tweet]:
         """Search for tweets by keywords"""
         tweets = []
+        batch_timestamp = time.time()
+        # Drop results that matched only through normalization or metadata, not the tweet text
+        matches = self._keyword_matcher(keywords)
         
-        for keyword in keywords:
+        def _search_one(keyword: str) -> List[Tweet]:
+            found = []
+            
             try:
-                print(f"🔍 Searching Twitter for: '{keyword}'")
+                self.logger.info(f"🔍 Searching Twitter for: '{keyword}'")
                 
-                for tweet in tqdm(tweepy.Cursor(self.api.search_tweets,
-                                              q=keyword,
-                                              tweet_mode='extended',
-                                              lang='ar',
-                                              count=100).items(max_tweets),
-                                total=max_tweets, desc=f"'{keyword}'"):
-                    
-                    tweet_data = {
-                        'source': 'twitter', 
-                        'id': tweet.id_str,
-                        'text_raw': tweet.full_text,
-                        'user': tweet.user.screen_name,
-                        'created_at': tweet.created_at.isoformat() if tweet.created_at else None,
-                        'likes': tweet.favorite_count,
-                        'retweets': tweet.retweet_count,
-                        'reply_count': getattr(tweet, 'reply_count', 0),
-                        'is_reply': False,
-                        'collection_timestamp': time.time()
-                    }
-                    tweets.append(tweet_data)
+                for tweet, username in self._paginate(self.client.search_recent_tweets, max_tweets, f"'{keyword}'",
+                                                      query=f"{keyword} lang:ar"):
+                    if matches(tweet.text):
+                        found.append(self._make_tweet(tweet, username, batch_timestamp, is_reply=False))
                     
             except tweepy.TweepyException as e:
-                print(f"❌ Error searching for '{keyword}': {e}")
+                self.logger.error(f"❌ Error searching for '{keyword}': {e}")
             except Exception as e:
-                print(f"❌ Unexpected error searching '{keyword}': {e}")
+                self.logger.error(f"❌ Unexpected error searching '{keyword}': {e}")
+            
+            return found
+        
+        # Keyword searches are independent network round-trips, so overlap them
+        with ThreadPoolExecutor(max_workers=min(8, len(keywords))) as executor:
+            for found in executor.map(_search_one, keywords):
+                tweets.extend(found)
         
         return tweets
 
-    def _get_user_tweets(self, username: str, max_tweets: int = 100) -> List[Dict]:
+    def _get_user_tweets(self, username: str, max_tweets: int = 100) -> List[Tweet]:
         """Get tweets from a specific user"""
         tweets = []
+        batch_timestamp = time.time()
         
         try:
-            print(f"🔍 Getting tweets from user: {username}")
+            self.logger.info(f"🔍 Getting tweets from user: {username}")
             
-            for tweet in tqdm(tweepy.Cursor(self.api.user_timeline,
-                                          screen_name=username,
-                                          tweet_mode='extended',
-                                          count=100,
-                                          exclude_replies=False,
-                                          include_rts=False).items(max_tweets),
-                            total=max_tweets, desc=f"@{username}"):
-                
-                tweet_data = {
-                    'source': 'twitter',
-                    'id': tweet.id_str,
-                    'text_raw': tweet.full_text,
-                    'user': tweet.user.screen_name,
-                    'created_at': tweet.created_at.isoformat() if tweet.created_at else None,
-                    'likes': tweet.favorite_count,
-                    'retweets': tweet.retweet_count,
-                    'reply_count': getattr(tweet, 'reply_count', 0),
-                    'is_reply': tweet.in_reply_to_status_id is not None,
-                    'collection_timestamp': time.time()
-                }
-                tweets.append(tweet_data)
+            user = self.client.get_user(username=username).data
+            
+            for tweet, author in self._paginate(self.client.get_users_tweets, max_tweets, f"@{username}",
+                                                user.id, exclude=['retweets']):
+                tweets.append(self._make_tweet(tweet, author or username, batch_timestamp,
+                                               is_reply=tweet.in_reply_to_user_id is not None))
                 
         except tweepy.TweepyException as e:
-            print(f"❌ Error getting tweets from user {username}: {e}")
+            self.logger.error(f"❌ Error getting tweets from user {username}: {e}")
         except Exception as e:
-            print(f"❌ Unexpected error for user {username}: {e}")
+            self.logger.error(f"❌ Unexpected error for user {username}: {e}")
         
-        return tweets
\ No newline at end of file
+        return tweets
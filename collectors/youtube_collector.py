@@ -1,17 +1,70 @@
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from typing import List, Dict, Optional
-from tqdm import tqdm
+import httpx
+import orjson
+import queue
+import threading
+from typing import Callable, Iterator, List, Dict, Optional
 import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from .base_collector import BaseCollector
+from .record import YouTubeComment
+from utils.cache import ResponseCache
 from utils.config import Config
+from utils.ratelimit import TokenBucketRateLimiter
+
+API_URL = 'https://www.googleapis.com/youtube/v3'
+
+# Data API quota units charged per call; search is far more expensive than listing comments
+QUOTA_COST = {'search': 100, 'commentThreads': 1}
+
+# Shared by every YouTubeCollector so concurrent workers pace against one quota
+QUOTA_LIMITER = TokenBucketRateLimiter(max_tokens=100, refill_interval=1.0)
+
+# Throttling and transient server errors are retried with exponential backoff; anything else fails fast
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_ATTEMPTS = 3
+MAX_BACKOFF = 30
+
+# commentThreads costs one quota unit per call however many threads it returns, so always ask for a full page
+PAGE_SIZE = 100
+
+# Partial responses: only the fields the collector reads are sent back
+COMMENT_FIELDS = 'items(id,snippet/topLevelComment/snippet(textDisplay,authorDisplayName,publishedAt,likeCount),snippet/totalReplyCount),nextPageToken'
+SEARCH_FIELDS = 'items(id/videoId,snippet/title)'
+
+# Comment pages are reused across runs for six hours, so re-collecting a video costs no quota;
+# the cache lives under the repository root, like .env, whatever the working directory
+RESPONSE_CACHE = ResponseCache(str(Path(__file__).resolve().parent.parent / '.cache' / 'youtube'), ttl=6 * 60 * 60)
+
+# Comments fetched but not yet written; producers block once this many are waiting
+QUEUE_SIZE = 10_000
+
+# HTTP/2 lets the worker threads multiplex their requests over a few connections to googleapis.com
+CLIENT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=64)
+
+@lru_cache(maxsize=None)
+def _make_client(api_key: str) -> httpx.Client:
+    """Build an HTTP/2 client for the YouTube Data API REST endpoints, reused for as long as the API key is unchanged"""
+    return httpx.Client(http2=True, limits=CLIENT_LIMITS, timeout=30.0, params={'key': api_key})
+
+def _backoff_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying: the server's Retry-After if given, else exponential"""
+    retry_after = response.headers.get('Retry-After', '')
+    if retry_after.isdigit():
+        return min(MAX_BACKOFF, int(retry_after))
+    return min(MAX_BACKOFF, 2 ** (attempt - 1))
 
 class YouTubeCollector(BaseCollector):
     """YouTube comments collector"""
     
-    def __init__(self):
+    source_key = 'video_id'
+    
+    def __init__(self, limiter: Optional[TokenBucketRateLimiter] = None, cache: Optional[ResponseCache] = None):
         super().__init__('youtube')
         self.youtube = None
+        self.limiter = limiter or QUOTA_LIMITER
+        self.cache = cache or RESPONSE_CACHE
     
     def authenticate(self):
         """Authenticate with YouTube API using API key"""
@@ -19,76 +72,137 @@ class YouTubeCollector(BaseCollector):
             if not Config.YOUTUBE_API_KEY:
                 raise ValueError("YouTube API key not found in configuration")
                 
-            self.youtube = build('youtube', 'v3', developerKey=Config.YOUTUBE_API_KEY)
-            print("✅ YouTube API authenticated successfully")
+            self.youtube = _make_client(Config.YOUTUBE_API_KEY)
+            self.logger.info("✅ YouTube API authenticated successfully")
             return True
             
         except Exception as e:
-            print(f"❌ YouTube authentication failed: {e}")
+            self.logger.error(f"❌ YouTube authentication failed: {e}")
             return False
 
-    def collect_by_id(self, video_id: str, limit: int = 100) -> List[Dict]:
+    def collect_by_id(self, video_id: str, limit: int = 100) -> int:
         """Collect comments from a specific video ID"""
         if not self.youtube:
             if not self.authenticate():
-                return []
+                return 0
         
-        print(f"🎯 YouTube direct mode for video: {video_id}")
-        comments = self._get_video_comments(video_id, limit)
-        self.collected_data.extend(comments)
-        return comments
+        self.logger.info(f"🎯 YouTube direct mode for video: {video_id}")
+        return self._pipeline([lambda: self.iter_video_comments(video_id, limit)], limit)
 
-    def collect_by_keywords(self, keywords: List[str], limit: int = 100, **kwargs) -> List[Dict]:
+    def collect_by_keywords(self, keywords: List[str], limit: int = 100, **kwargs) -> int:
         """Collect comments by searching for videos with keywords"""
         if not self.youtube:
             if not self.authenticate():
-                return []
+                return 0
+        
+        self.logger.info(f"🎯 YouTube search mode with keywords: {keywords}")
+        return self._search_and_collect(keywords, limit)
+
+    def _request(self, resource: str, **params) -> Dict:
+        """GET a Data API resource, paced by the quota limiter and retried on 429/5xx, and return the decoded response"""
+        # httpx would send None as an empty value, so unset parameters are dropped
+        params = {key: value for key, value in params.items() if value is not None}
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            self.limiter.acquire(QUOTA_COST.get(resource, 1))
+            response = self.youtube.get(f"{API_URL}/{resource}", params=params)
+            self.limiter.update_from_headers(response.headers)
+            
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_ATTEMPTS:
+                response.raise_for_status()
+                return orjson.loads(response.content)
+            
+            delay = _backoff_delay(response, attempt)
+            self.logger.warning(f"⏳ YouTube {resource} returned {response.status_code}, retrying in {delay}s ({attempt}/{MAX_ATTEMPTS})")
+            time.sleep(delay)
+
+    def _pipeline(self, producers: List[Callable[[], Iterator[YouTubeComment]]], limit: int) -> int:
+        """Run producers on a thread pool while this thread consumes their records into _add; returns how many were added"""
+        records = queue.Queue(maxsize=QUEUE_SIZE)
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            # Time out periodically so a producer blocked on a full queue notices the consumer has stopped
+            while not stop.is_set():
+                try:
+                    records.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def produce(fetch):
+            try:
+                for record in fetch():
+                    # Leaving the loop closes the generator, so no further pages are requested
+                    if not put(record):
+                        break
+            finally:
+                # One sentinel per producer tells the consumer it has finished
+                put(None)
         
-        print(f"🎯 YouTube search mode with keywords: {keywords}")
-        comments = self._search_and_collect(keywords, limit)
-        self.collected_data.extend(comments)
-        return comments
-
-    def _get_video_comments(self, video_id: str, max_results: int = 100) -> List[Dict]:
-        """Get comments from a specific video by ID"""
-        comments = []
-        next_page_token = None
+        added = 0
+        with ThreadPoolExecutor(max_workers=min(8, len(producers))) as executor:
+            for fetch in producers:
+                executor.submit(produce, fetch)
+            
+            try:
+                finished = 0
+                while finished < len(producers) and added < limit:
+                    record = records.get()
+                    if record is None:
+                        finished += 1
+                    elif self._add(record):
+                        added += 1
+            finally:
+                # Release producers on the limit or on a consumer error, so the executor can shut down
+                stop.set()
+        return added
+
+    def iter_video_comments(self, video_id: str, max_results: int = 100, collection_method: str = 'direct_id',
+                            search_keywords: Optional[List[str]] = None) -> Iterator[YouTubeComment]:
+        """Yield comments from a specific video by ID, page by page"""
+        batch_timestamp = time.time()
+        # '' marks the first page; None means there are no more pages
+        next_page_token = ''
         total_collected = 0
         
         try:
-            with tqdm(total=max_results, desc=f"📹 Video {video_id[:8]}...") as pbar:
-                while total_collected < max_results:
-                    remaining = max_results - total_collected
-                    request_max = min(100, remaining)
-                    
-                    request = self.youtube.commentThreads().list(
-                        part='snippet',
-                        videoId=video_id,
-                        maxResults=request_max,
-                        pageToken=next_page_token,
-                        textFormat='plainText'
-                    )
-                    response = request.execute()
+            with self._progress(total=max_results, desc=f"📹 Video {video_id[:8]}...") as pbar:
+                while total_collected < max_results and next_page_token is not None:
+                    cache_key = f"yt:ct:{video_id}:{next_page_token or 'root'}"
+                    response = self.cache.get(cache_key)
+                    if response is None:
+                        response = self._request(
+                            'commentThreads',
+                            part='snippet',
+                            videoId=video_id,
+                            maxResults=PAGE_SIZE,
+                            pageToken=next_page_token or None,
+                            textFormat='plainText',
+                            fields=COMMENT_FIELDS
+                        )
+                        # The page is already paid for; a failed cache write must not lose it
+                        if not self.cache.set(cache_key, response):
+                            self.logger.warning(f"⚠️ Could not cache comment page for video {video_id}")
                     
                     if not response.get('items'):
                         break
                     
                     for item in response.get('items', []):
-                        comment = item['snippet']['topLevelComment']['snippet']
-                        comment_data = {
-                            'source': 'youtube',
-                            'id': item['id'],
-                            'video_id': video_id,
-                            'text_raw': comment['textDisplay'],
-                            'user': comment['authorDisplayName'],
-                            'created_at': comment['publishedAt'],
-                            'likes': comment['likeCount'],
-                            'reply_count': comment.get('totalReplyCount', 0),
-                            'parent_id': None,
-                            'collection_timestamp': time.time(),
-                            'collection_method': 'direct_id'
-                        }
-                        comments.append(comment_data)
+                        snippet = item['snippet']
+                        comment = snippet['topLevelComment']['snippet']
+                        yield YouTubeComment(
+                            id=item['id'],
+                            video_id=video_id,
+                            text_raw=comment['textDisplay'],
+                            user=comment['authorDisplayName'],
+                            created_at=comment['publishedAt'],
+                            likes=comment['likeCount'],
+                            reply_count=snippet.get('totalReplyCount', 0),
+                            collection_timestamp=batch_timestamp,
+                            collection_method=collection_method,
+                            search_keywords=search_keywords
+                        )
                         total_collected += 1
                         pbar.update(1)
                         
@@ -96,83 +210,78 @@ class YouTubeCollector(BaseCollector):
                             break
                     
                     next_page_token = response.get('nextPageToken')
-                    if not next_page_token:
-                        break
-                        
-                    time.sleep(0.1)
                         
-        except HttpError as e:
-            if e.resp.status == 403:
-                print(f"🔒 Comments disabled for video {video_id}")
-            elif e.resp.status == 404:
-                print(f"❌ Video {video_id} not found")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 403:
+                self.logger.warning(f"🔒 Comments disabled for video {video_id}")
+            elif e.response.status_code == 404:
+                self.logger.error(f"❌ Video {video_id} not found")
             else:
-                print(f"❌ Error getting comments for video {video_id}: {e}")
+                self.logger.error(f"❌ Error getting comments for video {video_id}: {e}")
         except Exception as e:
-            print(f"❌ Unexpected error for video {video_id}: {e}")
-        
-        return comments
+            self.logger.error(f"❌ Unexpected error for video {video_id}: {e}")
 
-    def _search_and_collect(self, keywords: List[str], limit: int = 100) -> List[Dict]:
+    def _search_and_collect(self, keywords: List[str], limit: int = 100) -> int:
         """Search for videos by keywords and collect comments"""
         video_ids = self._search_videos_by_keywords(keywords, max_videos=10)
         
         if not video_ids:
-            print("❌ No videos found with the given keywords")
-            return []
+            self.logger.error("❌ No videos found with the given keywords")
+            return 0
             
-        print(f"📹 Processing {len(video_ids)} videos...")
-        comments = []
-        
+        self.logger.info(f"📹 Processing {len(video_ids)} videos...")
         comments_per_video = max(1, limit // len(video_ids))
         
-        for video_id in video_ids:
-            if len(comments) >= limit:
-                break
-                
-            video_comments = self._get_video_comments(video_id, comments_per_video)
-            
-            # Update collection method for search results
-            for comment in video_comments:
-                comment['collection_method'] = 'keyword_search'
-                comment['search_keywords'] = keywords
-                
-            comments.extend(video_comments)
-            print(f"  ✅ Video {video_id[:8]}: {len(video_comments)} comments")
-            
-        return comments
+        # Each producer paginates one video's comments, tagged as search results
+        def fetch(video_id):
+            return lambda: self.iter_video_comments(
+                video_id, comments_per_video,
+                collection_method='keyword_search', search_keywords=keywords
+            )
+        
+        added = self._pipeline([fetch(video_id) for video_id in video_ids], limit)
+        self.logger.info(f"  ✅ {added} comments from {len(video_ids)} videos")
+        return added
 
     def _search_videos_by_keywords(self, keywords: List[str], max_videos: int = 50) -> List[str]:
-        """Search for videos by keywords and return video IDs"""
+        """Search for videos by keywords and return unique video IDs"""
         video_ids = []
+        seen = set()
         
         for keyword in keywords:
+            if len(video_ids) >= max_videos:
+                break
+                
             try:
-                print(f"🔍 Searching YouTube for: '{keyword}'")
-                request = self.youtube.search().list(
+                self.logger.info(f"🔍 Searching YouTube for: '{keyword}'")
+                response = self._request(
+                    'search',
                     part='id,snippet',
                     q=keyword,
                     type='video',
                     maxResults=min(50, max_videos - len(video_ids)),
                     regionCode='TN',
-                    relevanceLanguage='ar'
+                    relevanceLanguage='ar',
+                    fields=SEARCH_FIELDS
                 )
-                response = request.execute()
                 
                 for item in response.get('items', []):
                     video_id = item['id']['videoId']
+                    # Overlapping keywords often return the same video; fetch its comments once
+                    if video_id in seen:
+                        continue
+                    seen.add(video_id)
+                    
                     video_title = item['snippet']['title']
                     video_ids.append(video_id)
-                    print(f"  📹 Found: {video_title[:50]}... (ID: {video_id})")
+                    self.logger.info(f"  📹 Found: {video_title[:50]}... (ID: {video_id})")
                     
                     if len(video_ids) >= max_videos:
                         break
                         
-                time.sleep(0.1)
-                        
-            except HttpError as e:
-                print(f"❌ Error searching for keyword '{keyword}': {e}")
+            except httpx.HTTPStatusError as e:
+                self.logger.error(f"❌ Error searching for keyword '{keyword}': {e}")
             except Exception as e:
-                print(f"❌ Unexpected error searching '{keyword}': {e}")
+                self.logger.error(f"❌ Unexpected error searching '{keyword}': {e}")
         
         return video_ids
\ No newline at end of file
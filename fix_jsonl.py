@@ -1,59 +1,85 @@
-import json
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import orjson
+
+CHUNK_SIZE = 1 << 16
+
+# The only bytes that can change brace depth or string state; everything else is skipped in C
+STRUCTURAL = re.compile(rb'[{}"\\]')
+
+def iter_json_objects(stream, chunk_size=CHUNK_SIZE):
+    """Yield the raw bytes of each top-level {...} object, tracking brace depth outside of strings"""
+    buffer = bytearray()
+    depth = 0
+    in_string = False
+    skip_until = 0  # offset in the current chunk before which matches are escaped bytes
+    
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        obj_start = 0
+        for match in STRUCTURAL.finditer(chunk):
+            pos = match.start()
+            if pos < skip_until:
+                continue
+            char = chunk[pos]
+            
+            if depth == 0:
+                # Between objects only an opening brace matters
+                if char == ord('{'):
+                    depth = 1
+                    obj_start = pos
+            elif in_string:
+                if char == ord('\\'):
+                    skip_until = pos + 2
+                elif char == ord('"'):
+                    in_string = False
+            elif char == ord('"'):
+                in_string = True
+            elif char == ord('{'):
+                depth += 1
+            elif char == ord('}'):
+                depth -= 1
+                if depth == 0:
+                    if buffer:
+                        buffer += chunk[obj_start:pos + 1]
+                        yield bytes(buffer)
+                        buffer.clear()
+                    else:
+                        yield chunk[obj_start:pos + 1]
+        
+        # Carry an unfinished object (and a pending escape) into the next chunk
+        if depth > 0:
+            buffer += chunk[obj_start:]
+        skip_until = max(0, skip_until - len(chunk))
 
 def quick_fix_jsonl(input_file, output_file=None):
     """Quick fix for a single JSONL file"""
     if output_file is None:
-        output_file = input_file.replace('.jsonl', '_fixed.jsonl')
+        # Keep the extension so .json inputs are never overwritten in place
+        root, ext = os.path.splitext(input_file)
+        output_file = f"{root}_fixed{ext}"
     
-    with open(input_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Split by objects (assuming each object starts with '{' and ends with '}')
-    objects = []
-    current_obj = []
-    in_object = False
-    brace_count = 0
-    
-    for line in content.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-            
-        if line.startswith('{') and not in_object:
-            in_object = True
-            current_obj = [line]
-            brace_count = line.count('{') - line.count('}')
-        elif in_object:
-            current_obj.append(line)
-            brace_count += line.count('{') - line.count('}')
-            
-            if brace_count == 0:
-                obj_str = ''.join(current_obj)
-                try:
-                    json_obj = json.loads(obj_str)
-                    objects.append(json_obj)
-                except json.JSONDecodeError:
-                    print(f"Failed to parse: {obj_str[:100]}...")
-                current_obj = []
-                in_object = False
+    count = 0
     
-    # Write fixed file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for obj in objects:
-            f.write(json.dumps(obj, ensure_ascii=False) + '\n')
+    # Read fixed-size chunks so memory stays bounded by the largest object, not the file
+    with open(input_file, 'rb') as fin, open(output_file, 'wb') as fout:
+        for raw in iter_json_objects(fin):
+            try:
+                fout.write(orjson.dumps(orjson.loads(raw)) + b'\n')
+                count += 1
+            except orjson.JSONDecodeError:
+                print(f"Failed to parse: {raw[:100].decode('utf-8', 'replace')}...")
     
-    print(f"Fixed {len(objects)} objects to {output_file}")
+    print(f"Fixed {count} objects to {output_file}")
 
-# Usage
+def find_unfixed_files(directory='collected_data'):
+    """Raw YouTube exports in directory, skipping the _fixed outputs of earlier runs"""
+    paths = glob.glob(os.path.join(directory, 'data_youtube_id_*.jsonl')) + glob.glob(os.path.join(directory, 'data_youtube_id_*.json'))
+    return sorted(path for path in paths if not os.path.splitext(path)[0].endswith('_fixed'))
 
-quick_fix_jsonl("collected_data/data_youtube_id_8wlN5coe_20251029_234025.jsonl")
-quick_fix_jsonl("collected_data/data_youtube_id_9bmG_8-U_20251029_233917.jsonl")
-quick_fix_jsonl("collected_data/data_youtube_id_bS4VpsEI_20251029_234041.jsonl")
-quick_fix_jsonl("collected_data/data_youtube_id_c7bNxL5X_20251029_233926.jsonl")
-quick_fix_jsonl("collected_data/data_youtube_id_cs_IfoSh_20251029_234030.jsonl")
-quick_fix_jsonl("collected_data/data_youtube_id_e9Zu1sCx_20251029_233636.jsonl")
-quick_fix_jsonl("collected_data/data_youtube_id_gd_YgVui_20251029_233900.jsonl")
-quick_fix_jsonl("collected_data/data_youtube_id_J3ekaaxh_20251029_150316.jsonl")
-quick_fix_jsonl("collected_data/data_youtube_id_nXDYorO5_20251029_233907.jsonl")
-quick_fix_jsonl("collected_data/data_youtube_id_P9YsWNho_20251029_233849.jsonl")
-quick_fix_jsonl("collected_data/data_youtube_id_QNbgDANI_20251029_234047.json")
\ No newline at end of file
+if __name__ == '__main__':
+    paths = find_unfixed_files()
+    # Files are independent, so each one is fixed on its own core
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(quick_fix_jsonl, paths))
@@ -1,7 +1,29 @@
 import pandas as pd
 import numpy as np
-import json
+import orjson
 import os
+from concurrent.futures import ProcessPoolExecutor
+import pyarrow as pa
+import pyarrow.json as pajson
+
+# Only the fields the merged dataset needs are parsed; everything else in a record is skipped
+JSONL_SCHEMA = pa.schema([
+    ('source', pa.string()),
+    ('id', pa.string()),
+    ('source_id', pa.string()),
+    ('text_raw', pa.string()),
+    ('text', pa.string()),
+    ('content', pa.string()),
+])
+JSONL_PARSE_OPTIONS = pajson.ParseOptions(explicit_schema=JSONL_SCHEMA, unexpected_field_behavior='ignore')
+
+# Compact dtypes for the merged dataset: few distinct sources, 0/1 labels, Arrow-backed strings
+DATASET_DTYPES = {
+    'source': 'category',
+    'source_id': 'string[pyarrow]',
+    'text': 'string[pyarrow]',
+    'label': 'int8',
+}
 
 def get_jsonl_directory():
     """Get JSONL directory path from user input with validation"""
@@ -11,51 +33,87 @@ def get_jsonl_directory():
         jsonl_dir = os.path.join(script_dir, "collected_data")
     return jsonl_dir
 
+def read_jsonl_file(file_path):
+    """Read a JSONL file into a DataFrame, falling back to line-by-line parsing for malformed files"""
+    try:
+        return pajson.read_json(file_path, parse_options=JSONL_PARSE_OPTIONS).to_pandas()
+    except pa.ArrowInvalid as e:
+        print(f"Falling back to line-by-line parsing for {os.path.basename(file_path)}: {e}")
+    
+    records = []
+    with open(file_path, 'rb') as f:
+        for line_num, line in enumerate(f, 1):
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError as e:
+                print(f"Error parsing JSON in file {os.path.basename(file_path)} at line {line_num}: {e}")
+    return pd.DataFrame(records)
+
+def coalesce(df, columns):
+    """First non-null value per row across the given columns (NaN where none is set)"""
+    result = pd.Series(np.nan, index=df.index, dtype=object)
+    for column in columns:
+        if column in df:
+            result = result.where(result.notna(), df[column])
+    return result
+
+def to_dataset_rows(df):
+    """Map raw collector records to source/source_id/text/label rows, dropping empty texts"""
+    # Non-string texts become NaN under .str and are dropped along with blank ones
+    text = coalesce(df, ['text_raw', 'text', 'content']).str.strip()
+    keep = text.str.len() > 0
+    
+    source = df['source'].fillna('unknown') if 'source' in df else 'unknown'
+    rows = pd.DataFrame({
+        'source': source,
+        'source_id': coalesce(df, ['id', 'source_id']),
+        'text': text,
+        'label': 0  # Always 0
+    }, index=df.index)
+    return rows[keep]
+
+def _parse_one(file_path):
+    """Parse one JSONL file into dataset rows; runs in a worker process"""
+    filename = os.path.basename(file_path)
+    print(f"Processing {filename}...")
+    try:
+        return to_dataset_rows(read_jsonl_file(file_path))
+    except Exception as e:
+        print(f"Unexpected error processing {filename}: {e}")
+        return None
+
 def process_jsonl_files(jsonl_directory):
     """Process YouTube and Reddit JSONL files, label always set to 0"""
-    processed_data = []
-
     if not os.path.exists(jsonl_directory):
         print(f"Warning: JSONL directory '{jsonl_directory}' does not exist")
-        return pd.DataFrame(processed_data)
-
-    jsonl_files_found = False
-    for filename in os.listdir(jsonl_directory):
-        if filename.endswith('.jsonl'):
-            jsonl_files_found = True
-            file_path = os.path.join(jsonl_directory, filename)
-            print(f"Processing {filename}...")
-
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        data = json.loads(line.strip())
-                        source = data.get('source', 'unknown')
-                        source_id = data.get('id', data.get('source_id', np.nan))
-                        text = data.get('text_raw', data.get('text', data.get('content', '')))
-
-                        if text and text.strip():
-                            processed_data.append({
-                                'source': source,
-                                'source_id': source_id,
-                                'text': text.strip(),
-                                'label': 0  # Always 0
-                            })
-                    except json.JSONDecodeError as e:
-                        print(f"Error parsing JSON in file {filename} at line {line_num}: {e}")
-                    except Exception as e:
-                        print(f"Unexpected error processing {filename} at line {line_num}: {e}")
-
-    if not jsonl_files_found:
+        return pd.DataFrame()
+
+    jsonl_paths = [os.path.join(jsonl_directory, filename)
+                   for filename in os.listdir(jsonl_directory) if filename.endswith('.jsonl')]
+    if not jsonl_paths:
         print(f"No JSONL files found in {jsonl_directory}")
-    else:
-        print(f"Successfully processed {len(processed_data)} items from JSONL files")
+        return pd.DataFrame()
+
+    # Files are independent, so each is parsed on its own core; map keeps directory order
+    with ProcessPoolExecutor(max_workers=min(len(jsonl_paths), os.cpu_count() or 1)) as executor:
+        frames = [frame for frame in executor.map(_parse_one, jsonl_paths) if frame is not None]
 
-    return pd.DataFrame(processed_data)
+    if not frames:
+        print(f"No data could be read from {jsonl_directory}")
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True).astype(DATASET_DTYPES)
+    print(f"Successfully processed {len(df)} items from JSONL files")
+    return df
+
+def wants_excel_export():
+    """Ask whether an Excel copy should be written next to the Parquet output"""
+    answer = input("Also export an Excel copy for manual review? [y/N]: ").strip().lower()
+    return answer in ('y', 'yes')
 
 def main():
     jsonl_dir = get_jsonl_directory()
-    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "collected_dataset.xlsx")
+    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "collected_dataset.parquet")
     print(f"JSONL directory: {jsonl_dir}")
     print(f"Output file will be: {output_path}")
 
@@ -63,10 +121,20 @@ def main():
 
     if len(df) > 0:
         try:
-            df.to_excel(output_path, index=False, engine='openpyxl')
+            df.to_parquet(output_path, engine='pyarrow', compression='snappy', index=False)
             print(f"Dataset saved to {output_path} with {len(df)} rows (all labels = 0)")
         except Exception as e:
-            print(f"Error saving Excel file: {e}")
+            print(f"Error saving Parquet file: {e}")
+            return
+
+        # Excel is slow to write and only meant for people opening the data by hand
+        if wants_excel_export():
+            excel_path = output_path.replace('.parquet', '.xlsx')
+            try:
+                df.to_excel(excel_path, index=False, engine='openpyxl')
+                print(f"Excel copy saved to {excel_path}")
+            except Exception as e:
+                print(f"Error saving Excel file: {e}")
     else:
         print("No data processed from JSONL files.")
 
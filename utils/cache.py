@@ -0,0 +1,43 @@
+# utils/cache.py
+import hashlib
+import os
+import tempfile
+import time
+import orjson
+from typing import Any, Optional
+
+class ResponseCache:
+    """On-disk cache of decoded API responses, one file per key, expiring after ttl seconds"""
+    
+    def __init__(self, directory: str, ttl: float):
+        self.directory = directory
+        self.ttl = ttl
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if it is missing or expired"""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+    
+    def set(self, key: str, value: Any) -> bool:
+        """Store value under key, replacing the file atomically so concurrent readers never see partial writes; returns False if it could not be written"""
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps(value))
+            os.replace(tmp_path, self._path(key))
+            return True
+        except (OSError, orjson.JSONEncodeError):
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return False
@@ -1,43 +1,49 @@
 # utils/config.py
 import os
+from pathlib import Path
+from typing import Final, Optional
 from dotenv import load_dotenv
 
-load_dotenv()
+# Read the .env at the repository root directly instead of searching parent directories
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / '.env', override=False)
+
+# Set once validate_config has passed; credentials are read only at import, so they cannot change afterwards
+_VALIDATED = False
 
 class Config:
     """Configuration manager for all API credentials"""
     
     # YouTube
-    YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+    YOUTUBE_API_KEY: Final[Optional[str]] = os.getenv('YOUTUBE_API_KEY')
     
-    # Twitter/X
-    TWITTER_API_KEY = os.getenv('TWITTER_API_KEY')
-    TWITTER_API_SECRET = os.getenv('TWITTER_API_SECRET') 
-    TWITTER_ACCESS_TOKEN = os.getenv('TWITTER_ACCESS_TOKEN')
-    TWITTER_ACCESS_SECRET = os.getenv('TWITTER_ACCESS_SECRET')
+    # Twitter/X (API v2, app-only auth)
+    TWITTER_BEARER_TOKEN: Final[Optional[str]] = os.getenv('TWITTER_BEARER_TOKEN')
     
     # Reddit
-    REDDIT_CLIENT_ID = os.getenv('REDDIT_CLIENT_ID')
-    REDDIT_CLIENT_SECRET = os.getenv('REDDIT_CLIENT_SECRET')
-    REDDIT_USER_AGENT = os.getenv('REDDIT_USER_AGENT')
+    REDDIT_CLIENT_ID: Final[Optional[str]] = os.getenv('REDDIT_CLIENT_ID')
+    REDDIT_CLIENT_SECRET: Final[Optional[str]] = os.getenv('REDDIT_CLIENT_SECRET')
+    REDDIT_USER_AGENT: Final[Optional[str]] = os.getenv('REDDIT_USER_AGENT')
     
     @classmethod
     def validate_config(cls):
         """Validate that all required environment variables are set"""
+        global _VALIDATED
+        if _VALIDATED:
+            return
+            
         missing = []
         
         if not cls.YOUTUBE_API_KEY:
             missing.append('YOUTUBE_API_KEY')
             
-        twitter_creds = [cls.TWITTER_API_KEY, cls.TWITTER_API_SECRET, 
-                        cls.TWITTER_ACCESS_TOKEN, cls.TWITTER_ACCESS_SECRET]
-        if not all(twitter_creds):
-            missing.extend(['TWITTER_API_KEY', 'TWITTER_API_SECRET', 
-                          'TWITTER_ACCESS_TOKEN', 'TWITTER_ACCESS_SECRET'])
+        if not cls.TWITTER_BEARER_TOKEN:
+            missing.append('TWITTER_BEARER_TOKEN')
             
         reddit_creds = [cls.REDDIT_CLIENT_ID, cls.REDDIT_CLIENT_SECRET, cls.REDDIT_USER_AGENT]
         if not all(reddit_creds):
             missing.extend(['REDDIT_CLIENT_ID', 'REDDIT_CLIENT_SECRET', 'REDDIT_USER_AGENT'])
             
         if missing:
-            raise ValueError(f"Missing environment variables: {', '.join(missing)}")
\ No newline at end of file
+            raise ValueError(f"Missing environment variables: {', '.join(missing)}")
+            
+        _VALIDATED = True
\ No newline at end of file
@@ -0,0 +1,14 @@
+# utils/http.py
+import requests
+from requests.adapters import HTTPAdapter
+
+# Upper bound on keep-alive connections per host shared by a collector's worker threads
+MAX_CONNECTIONS = 32
+
+def pooled_session(max_connections: int = MAX_CONNECTIONS) -> requests.Session:
+    """Create a requests session whose connection pool can serve concurrent workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_connections)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -0,0 +1,57 @@
+# utils/ratelimit.py
+import threading
+import time
+from typing import Mapping
+
+class TokenBucketRateLimiter:
+    """Thread-safe token bucket holding up to max_tokens, refilled evenly over refill_interval seconds"""
+    
+    def __init__(self, max_tokens: float, refill_interval: float = 1.0):
+        self.max_tokens = max_tokens
+        self.refill_rate = max_tokens / refill_interval
+        self._tokens = float(max_tokens)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+    
+    def acquire(self, cost: float = 1):
+        """Block until cost tokens are available, then take them"""
+        cost = min(cost, self.max_tokens)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= cost:
+                        self._tokens -= cost
+                        return
+                    wait = (cost - self._tokens) / self.refill_rate
+            time.sleep(wait)
+    
+    def pause(self, seconds: float):
+        """Hold every caller for at least the given number of seconds"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+    
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Slow down when the server reports it is close to (or over) its limit"""
+        retry_after = headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            self.pause(int(retry_after))
+            
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining and remaining.isdigit():
+            with self._lock:
+                self._tokens = min(self._tokens, int(remaining))
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False